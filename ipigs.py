@@ -1,17 +1,42 @@
+import functools
 import time
 import json
+import logging
 import os
+import queue
+import threading
 import pygame
 from dataclasses import dataclass, field
 from typing import List, Callable, Optional
 from pygame.locals import *
-from decimal import Decimal
 from typing import Deque
 from collections import deque
 
+try:
+    import orjson  # C-backed JSON, noticeably faster for the save payload
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 # Enhanced Constants
 SCREEN_SIZE = (1280, 720)
 SAVE_FILE = "iseps_save.json"
+# Longest stretch a single economy tick will simulate (offline catch-up cap).
+MAX_OFFLINE_SECONDS = 3600.0
+# Economy tuning knobs, shared by the simulation and the UI readouts.
+PRESTIGE_THRESHOLD = 1000.0
+PRESTIGE_BONUS_STEP = 0.1
+UPGRADE_PRODUCTION_BONUS = 1.05
+BETA_UNLOCK_EARNINGS = 500.0
+GAMMA_UNLOCK_EARNINGS = 5000.0
+# How long a toast message stays on screen.
+MESSAGE_TTL_SECONDS = 3.0
+# Cost growth saturates here to keep cost_growth ** count bounded.
+_COST_EXPONENT_CAP = 1000
+# SDL timer event that paces the economy (fires every 100 ms).
+ECONOMY_EVENT = pygame.USEREVENT + 1
+ECONOMY_TIMER_MS = 100
 BASE_COLORS = {
     "background": (15, 20, 25),
     "text": (240, 240, 240),
@@ -27,8 +52,82 @@ BASE_COLORS = {
     "success": (100, 255, 100),
     "error": (255, 100, 100),
 }
+# Hot-path bindings for the palette entries touched every frame or click;
+# BASE_COLORS stays the palette of record.
+_COLOR_BG = BASE_COLORS["background"]
+_COLOR_TEXT = BASE_COLORS["text"]
+_COLOR_TEXT_DISABLED = BASE_COLORS["text_disabled"]
+_COLOR_BUTTON = BASE_COLORS["button"]
+_COLOR_BUTTON_HOVER = BASE_COLORS["button_hover"]
+_COLOR_BUTTON_DISABLED = BASE_COLORS["button_disabled"]
+_COLOR_SUCCESS = BASE_COLORS["success"]
+_COLOR_ERROR = BASE_COLORS["error"]
+_COLOR_ACHIEVEMENT = BASE_COLORS["achievement"]
+
+# Single source of truth for the starting particle roster; consumed by both
+# init_particles and ensure_default_particles.
+_PARTICLE_SPECS = {
+    "alpha": dict(
+        name="Alpha",
+        base_cost=10.0,
+        cost_growth=1.15,
+        base_production=1.0,
+        produces="cash",
+        color=BASE_COLORS["particle_alpha"],
+        description="Basic quantum particle, stable and reliable.",
+        upgrades=["Quantum Alignment", "Entanglement Boost"]
+    ),
+    "beta": dict(
+        name="Beta",
+        base_cost=50.0,
+        cost_growth=1.2,
+        base_production=0.0,  # Start with 0 base production
+        produces="beta",
+        color=BASE_COLORS["particle_beta"],
+        description="Generates Beta particles which boost Alpha production via upgrades.",
+        upgrades=["Tachyon Acceleration", "Chronal Syncing"],
+        unlocked=False
+    ),
+    "gamma": dict(
+        name="Gamma",
+        base_cost=250.0,
+        cost_growth=1.25,
+        base_production=10.0,
+        produces="gamma",
+        color=BASE_COLORS["particle_gamma"],
+        description="Highly energetic particle used to boost Beta production.",
+        unlocked=False
+    ),
+}
+
+def _make_particle(spec: dict) -> "ParticleType":
+    kwargs = dict(spec)
+    # Copy the mutable upgrade list so instances never share (or mutate) the
+    # module-level spec.
+    kwargs["upgrades"] = list(kwargs.get("upgrades", []))
+    return ParticleType(**kwargs)
+
+# Pre-bound formatters skip the f-string parse/dispatch on cache misses.
+_FMT_M = "{:.2f}M".format
+_FMT_K = "{:.2f}K".format
+_FMT = "{:.2f}".format
 
-@dataclass
+def _hit(x, y, w, h, mx, my):
+    # Plain-coordinate containment test for the once-per-frame broadphase
+    # checks; per-row tests stay on pygame.Rect.collidepoint (C-level).
+    return x <= mx < x + w and y <= my < y + h
+
+@functools.lru_cache(maxsize=4096)
+def format_number(num: float) -> str:
+    # Cached at module level: the same rounded values (costs, counts, rates)
+    # come up repeatedly across frames.
+    if num >= 1_000_000:
+        return _FMT_M(num * 1e-6)
+    elif num >= 1_000:
+        return _FMT_K(num * 1e-3)
+    return _FMT(num)
+
+@dataclass(slots=True)
 class ParticleType:
     name: str
     base_cost: float
@@ -41,32 +140,48 @@ class ParticleType:
     description: str = ""
     unlocked: bool = True
     purchased_upgrades: List[str] = field(default_factory=list)  # Track which upgrades are actually purchased
+    _cached_cost_key: float = field(default=-1.0, init=False, repr=False)
+    _cached_cost: Optional[float] = field(default=None, init=False, repr=False)
+    _upgrade_mult: float = field(default=1.0, init=False, repr=False)
+    _cached_prod_key: Optional[tuple] = field(default=None, init=False, repr=False)
+    _cached_prod: float = field(default=0.0, init=False, repr=False)
 
-    def calculate_cost(self) -> Decimal:
-        max_exponent = 1000
-        exponent = max_exponent if self.count > max_exponent else self.count
-        raw_cost = float(self.base_cost) * (float(self.cost_growth) ** exponent)
-        return Decimal(str(round(raw_cost, 2)))  # Convert to Decimal after calculation
-    
-    def calculate_production_per_second(self, prestige_bonus: Decimal) -> Decimal:
-    # Convert all values to Decimal for consistent calculation
-        count_decimal = Decimal(str(self.count))
-        base_production_decimal = Decimal(str(self.base_production))
-        prestige_bonus_decimal = Decimal(str(prestige_bonus))  # Convert prestige_bonus to Decimal
+    def calculate_cost(self) -> float:
+        # The cost only changes when count changes (a purchase), but the UI
+        # asks for it every frame — cache the last result keyed on count.
+        if self.count == self._cached_cost_key and self._cached_cost is not None:
+            return self._cached_cost
+        exponent = _COST_EXPONENT_CAP if self.count > _COST_EXPONENT_CAP else self.count
+        raw_cost = self.base_cost * self.cost_growth ** exponent
+        self._cached_cost_key = self.count
+        self._cached_cost = round(raw_cost, 2)
+        return self._cached_cost
     
-    # Calculate base production
-        base_production = count_decimal * base_production_decimal * prestige_bonus_decimal
-    
-    # Apply upgrade multipliers
-        production_multiplier = Decimal('1.0')
-        for upgrade_name in self.purchased_upgrades:
-        # Apply 5% increase per purchased upgrade
-            production_multiplier *= Decimal('1.05')
-        
-        return base_production * production_multiplier
+    def calculate_production_per_second(self, prestige_bonus: float) -> float:
+        # Pure function of (count, base_production, prestige_bonus) plus the
+        # upgrade multiplier, which only changes on purchase — memoize it so
+        # the per-frame draw calls hit the cache.
+        key = (self.count, self.base_production, prestige_bonus)
+        if key == self._cached_prod_key:
+            return self._cached_prod
+
+        production = self.count * self.base_production * prestige_bonus * self._upgrade_mult
+        self._cached_prod_key = key
+        self._cached_prod = production
+        return production
+
     def add_purchased_upgrade(self, upgrade_name: str):
         if upgrade_name not in self.purchased_upgrades:
             self.purchased_upgrades.append(upgrade_name)
+            # Each purchased upgrade grants a flat 5% production increase;
+            # fold it in incrementally rather than recomputing the power.
+            self._upgrade_mult *= UPGRADE_PRODUCTION_BONUS
+            self._cached_prod_key = None
+
+    def _recompute_upgrade_mult(self):
+        # Rebuild from scratch after load, when upgrades arrive in bulk.
+        self._upgrade_mult = UPGRADE_PRODUCTION_BONUS ** len(self.purchased_upgrades)
+        self._cached_prod_key = None
 
     def to_dict(self) -> dict:
         data = {
@@ -88,33 +203,39 @@ class ParticleType:
     def from_dict(cls, data: dict) -> "ParticleType":
         particle = cls(
             name=data["name"],
-            base_cost=data["base_cost"],
-            cost_growth=data["cost_growth"],
-            base_production=data["base_production"],
+            # float() also accepts the string-encoded numbers older
+            # (Decimal-era) saves wrote.
+            base_cost=float(data["base_cost"]),
+            cost_growth=float(data["cost_growth"]),
+            base_production=float(data["base_production"]),
             produces=data["produces"],
             color=tuple(data["color"]),
-            count=data["count"],
+            count=float(data["count"]),
             upgrades=data.get("upgrades", []),
             description=data.get("description", ""),
             unlocked=data.get("unlocked", True)
         )
         particle.purchased_upgrades = data.get("purchased_upgrades", [])
+        particle._recompute_upgrade_mult()
         return particle
 
-@dataclass
 class Achievement:
+    # Hand-written __init__ (the condition callable doesn't fit dataclass
+    # field generation), so declare slots manually.
+    __slots__ = ("name", "description", "condition", "reward", "unlocked")
+
     def __init__(self, name: str, description: str, condition: Callable[["GameState"], bool], reward: float, unlocked: bool = False):
         self.name = name
         self.description = description
         self.condition = condition
-        self.reward = Decimal(str(reward))  # 将 reward 转换为 Decimal 类型
+        self.reward = float(reward)
         self.unlocked = unlocked
 
     def to_dict(self) -> dict:
         return {
             "name": self.name,
             "description": self.description,
-            "reward": float(self.reward),  # 转换为浮点数
+            "reward": float(self.reward),
             "unlocked": self.unlocked
         }
     
@@ -123,12 +244,12 @@ class Achievement:
         return cls(
             name=data["name"],
             description=data["description"],
-            condition=lambda state: False,  # 需要根据实际情况实现条件
-            reward=Decimal(str(data["reward"])),
+            condition=lambda state: False,  # conditions are rebound at init
+            reward=float(data["reward"]),
             unlocked=data["unlocked"]
         )
 
-@dataclass
+@dataclass(slots=True)
 class Upgrade:
     name: str
     cost: float
@@ -138,6 +259,23 @@ class Upgrade:
     particle_requirement: str
     currency: str = 'cash'
     unlocked: bool = False
+    _cost_text: Optional[str] = field(default=None, init=False, repr=False)
+    # Whether the required particle is unlocked; maintained by
+    # GameState._rebuild_unlocked so hot loops need a single attribute check.
+    _visible: bool = field(default=False, init=False, repr=False)
+    # Resolved by _rebuild_unlocked alongside _visible: the required particle,
+    # and the particle the cost is paid in (None means cash).
+    _required_particle: Optional["ParticleType"] = field(default=None, init=False, repr=False)
+    _currency_particle: Optional["ParticleType"] = field(default=None, init=False, repr=False)
+
+    def cost_text(self) -> str:
+        # Upgrade costs are static until purchase, so format once and reuse.
+        if self._cost_text is None:
+            if self.currency == 'cash':
+                self._cost_text = f"${format_number(round(float(self.cost), 2))}"
+            else:
+                self._cost_text = f"{self.cost} {self.currency}"
+        return self._cost_text
 
     def to_dict(self) -> dict:
         return {
@@ -152,82 +290,98 @@ class Upgrade:
 
 class GameState:
     def __init__(self):
-        self.cash = Decimal('50.0')
+        self.cash: float = 50.0
         self.prestige_level: int = 0
-        self.prestige_bonus: Decimal = Decimal('1.0')
+        self.prestige_bonus: float = 1.0
         self.last_update: float = time.time()
-        self.total_earnings: Decimal = Decimal('0.0')
+        self.total_earnings: float = 0.0
         self.message_queue: Deque = deque(maxlen=10)
+        # Production per second, refreshed by update_economy so the UI can
+        # read it instead of recomputing per frame.
+        self._production_cache = {}
+        # Shared aggregate for the count-based achievement conditions,
+        # refreshed once per check_achievements pass.
+        self._total_particle_count: float = 0.0
+        # The economy only needs ~10Hz regardless of who drives it.
+        self._econ_interval: float = 0.1
+        self._next_econ: float = 0.0
+        # Single-slot save pipeline: save() enqueues a snapshot, the worker
+        # writes it, newer snapshots supersede a queued one.
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._save_worker = threading.Thread(target=self._save_loop, daemon=True)
+        self._save_worker.start()
         self.init_particles()
         self.init_achievements()
         self.init_upgrades()
-        
+        # Earnings-gated unlocks, sorted by threshold and popped as they
+        # fire; once empty the tick pays a single truthiness check.
+        self._pending_unlocks = [
+            (BETA_UNLOCK_EARNINGS, "beta", "Beta particles unlocked! >>"),
+            (GAMMA_UNLOCK_EARNINGS, "gamma", "Gamma particles unlocked! >>"),
+        ]
+        self._rebuild_unlocked()
+
+    def _rebuild_unlocked(self):
+        # Re-filter once per unlock instead of branching per particle per
+        # tick; upgrades cache their visibility the same way. Each entry
+        # resolves its production target up front (None means cash), the
+        # scalar analogue of a precomputed produces-index column.
+        self._unlocked_particles = []
+        for name, particle in self.particles.items():
+            if not particle.unlocked:
+                continue
+            target = None
+            if particle.produces != "cash":
+                target = self.particles.get(particle.produces)
+                if target is None:
+                    # Misconfigured producer: warn once here instead of per
+                    # tick, and keep it out of the tick loop entirely.
+                    logger.warning("Particle %s produces unknown type %s", particle.name, particle.produces)
+                    continue
+            self._unlocked_particles.append((name, particle, target))
+        # Achievements are scanned from this list only; unlocks prune it.
+        self._locked_achievements = [a for a in self.achievements if not a.unlocked]
+        # Drop pending unlocks that a loaded save has already granted.
+        self._pending_unlocks = [
+            entry for entry in self._pending_unlocks
+            if entry[1] in self.particles and not self.particles[entry[1]].unlocked
+        ]
+        for upgrade in self.upgrades + self.booster_upgrades:
+            required = self.particles.get(upgrade.particle_requirement)
+            upgrade._required_particle = required
+            upgrade._visible = required is not None and required.unlocked
+            if upgrade.currency == 'cash':
+                upgrade._currency_particle = None
+            else:
+                upgrade._currency_particle = self.particles.get(upgrade.currency)
+                if upgrade._currency_particle is None:
+                    # Unknown currency: hide the row rather than letting a
+                    # None reference read as cash-payable.
+                    upgrade._visible = False
+
     def init_particles(self):
-        self.particles = {
-            "alpha": ParticleType(
-                name="Alpha",
-                base_cost=10,
-                cost_growth=1.15,
-                base_production=1.0,
-                produces="cash",
-                color=BASE_COLORS["particle_alpha"],
-                description="Basic quantum particle, stable and reliable.",
-                upgrades=["Quantum Alignment", "Entanglement Boost"]
-            ),
-            "beta": ParticleType(
-                name="Beta",
-                base_cost=50,
-                cost_growth=1.2,
-                base_production=0.0,  # Start with 0 base production
-                produces="beta",
-                color=BASE_COLORS["particle_beta"],
-                description="Generates Beta particles which boost Alpha production via upgrades.",
-                upgrades=["Tachyon Acceleration", "Chronal Syncing"],
-                unlocked=False
-            ),
-            "gamma": ParticleType(
-                name="Gamma",
-                base_cost=250,
-                cost_growth=1.25,
-                base_production=10.0,
-                produces="gamma",
-                color=BASE_COLORS["particle_gamma"],
-                description="Highly energetic particle used to boost Beta production.",
-                unlocked=False
-            )
-        }
-        
+        self.particles = {name: _make_particle(spec) for name, spec in _PARTICLE_SPECS.items()}
+
     def apply_upgrade_effect(self, upgrade: Upgrade):
-        if upgrade.particle_requirement in self.particles:
-            particle = self.particles[upgrade.particle_requirement]
-            
+        particle = upgrade._required_particle
+        if particle is not None:
             # Add the upgrade to the particle's purchased upgrades list
             particle.add_purchased_upgrade(upgrade.name)
-            
-            # Apply the specific upgrade effect
-            if upgrade.name == "Quantum Computing":
-                particle.base_production *= 2
-            elif upgrade.name == "Hyperspace Fabrication":
-                particle.base_production = 3.0  # Set initial production for Beta
-            elif upgrade.name == "Gamma Resonance":
-                particle.base_production *= 4
-            elif upgrade.name == "Beta Booster":
-                self.particles["alpha"].base_production *= 1.1
-            elif upgrade.name == "Gamma Booster":
-                self.particles["beta"].base_production *= 1.15
+
+            # Every Upgrade carries its effect callable; dispatch through it
+            # instead of re-deriving the effect from the name.
+            upgrade.effect()
 
     def process_upgrade_purchase(self, upgrade: Upgrade) -> bool:
         if upgrade.unlocked:
             return False
 
-        if upgrade.currency == 'cash':
+        if upgrade._currency_particle is None:
             if self.cash < upgrade.cost:
                 return False
             self.cash -= upgrade.cost
         else:
-            if upgrade.currency not in self.particles:
-                return False
-            particle = self.particles[upgrade.currency]
+            particle = upgrade._currency_particle
             if particle.count < upgrade.cost:
                 return False
             particle.count -= upgrade.cost
@@ -241,13 +395,13 @@ class GameState:
             Achievement(
                 name="Quantum Pioneer",
                 description="Produce your first Alpha particle",
-                condition=lambda state: any(p.count > 0 for p in state.particles.values()),
+                condition=lambda state: state._total_particle_count > 0,
                 reward=1.1
             ),
             Achievement(
                 name="Particle Magnate",
                 description="Own 50 total particles",
-                condition=lambda state: sum(p.count for p in state.particles.values()) >= 50,
+                condition=lambda state: state._total_particle_count >= 50,
                 reward=1.2
             ),
             Achievement(
@@ -313,7 +467,7 @@ class GameState:
         for upgrade_list in [self.upgrades, self.booster_upgrades]:
             for upgrade in upgrade_list:
                 if upgrade.particle_requirement not in self.particles:
-                    print(f"Warning: Upgrade {upgrade.name} references non-existent particle type {upgrade.particle_requirement}")
+                    logger.warning("Upgrade %s references non-existent particle type %s", upgrade.name, upgrade.particle_requirement)
                     continue
                 
                 particle = self.particles[upgrade.particle_requirement]
@@ -324,7 +478,9 @@ class GameState:
         self.particles["alpha"].base_production *= 2
 
     def apply_hyperspace_fabrication(self):
-        self.particles["beta"].base_production *= 3
+        # Beta starts at 0 production, so this sets the initial rate rather
+        # than multiplying it (0 * 3 would stay 0).
+        self.particles["beta"].base_production = 3.0
 
     def apply_gamma_resonance(self):
         self.particles["gamma"].base_production *= 4
@@ -335,103 +491,104 @@ class GameState:
     def apply_gamma_booster(self):
         self.particles["beta"].base_production *= 1.15
 
+    def warm_caches(self):
+        # Prime the per-particle cost and production memos so the first frame
+        # doesn't pay all the cold computations at once.
+        for particle in self.particles.values():
+            particle.calculate_cost()
+            particle.calculate_production_per_second(self.prestige_bonus)
+
     def time_since_last_update(self) -> float:
         return time.time() - self.last_update
 
-    def update_economy(self, time_diff: Optional[float] = None) -> Optional[List[str]]:
+    def update_economy(self, time_diff: Optional[float] = None, now: Optional[float] = None) -> Optional[List[str]]:
+        # Returns None when the tick was skipped (not due yet), otherwise the
+        # list of unlock messages (possibly empty). The economy owns its own
+        # ~10Hz throttle so every caller gets the same rate, not just the UI.
+        if now is None:
+            now = time.time()
         if time_diff is None:
-            time_diff = self.time_since_last_update()
-            
-        total_cash_earned = Decimal('0.0')
+            if now < self._next_econ:
+                return None
+            self._next_econ = now + self._econ_interval
+            time_diff = now - self.last_update
+        # After a long absence (sleep/resume, stale save) time_diff can be
+        # days; cap the catch-up so one tick never launches counts and costs
+        # into pathological ranges.
+        if time_diff > MAX_OFFLINE_SECONDS:
+            time_diff = MAX_OFFLINE_SECONDS
+
+
+        total_cash_earned = 0.0
         unlock_messages = []
 
-        for particle in self.particles.values():
-            if not particle.unlocked:
-                continue
-                
-            # Convert production to Decimal
-            production_per_second = Decimal(str(particle.calculate_production_per_second(float(self.prestige_bonus))))
-            produced = production_per_second * Decimal(str(time_diff))
+        # Locals for the loop: at three particles a NumPy structure-of-arrays
+        # rewrite would cost more in conversion than it saves, but repeated
+        # attribute lookups are free to hoist.
+        prestige_bonus = self.prestige_bonus
+        production_cache = self._production_cache
+        for name, particle, target in self._unlocked_particles:
+            production_per_second = particle.calculate_production_per_second(prestige_bonus)
+            production_cache[name] = production_per_second
+            produced = production_per_second * time_diff
 
-            if particle.produces == "cash":
+            if target is None:
                 self.cash += produced
                 total_cash_earned += produced
             else:
-                if particle.produces in self.particles:
-                    # For non-cash resources, keep using floats
-                    float_produced = float(produced)
-                    self.particles[particle.produces].count += float_produced
-                    self.particles[particle.produces].count = round(self.particles[particle.produces].count, 2)
-                else:
-                    print(f"Warning: Particle {particle.name} produces unknown type {particle.produces}")
+                # The UI rounds for display, so no cosmetic per-tick
+                # rounding here.
+                target.count += produced
 
         self.total_earnings += total_cash_earned
-        self.last_update = time.time()
+        self.last_update = now
 
-        # Check for unlocks based on total earnings
-        if float(self.total_earnings) >= 500 and not self.particles["beta"].unlocked:
-            self.particles["beta"].unlocked = True
-            unlock_messages.append("Beta particles unlocked! >>")
-        if float(self.total_earnings) >= 5000 and not self.particles["gamma"].unlocked:
-            self.particles["gamma"].unlocked = True
-            unlock_messages.append("Gamma particles unlocked! >>")
+        # Check for unlocks based on total earnings; the list is sorted by
+        # threshold, so the loop stops at the first one not yet reached.
+        while self._pending_unlocks and self.total_earnings >= self._pending_unlocks[0][0]:
+            _, name, message = self._pending_unlocks.pop(0)
+            self.particles[name].unlocked = True
+            unlock_messages.append(message)
+        if unlock_messages:
+            self._rebuild_unlocked()
 
-        return unlock_messages if unlock_messages else None
+        return unlock_messages
 
     def perform_prestige(self) -> bool:
-        if self.cash >= Decimal('1000'):
+        if self.cash >= PRESTIGE_THRESHOLD:
             self.prestige_level += 1
-            self.prestige_bonus = Decimal('1.0') + Decimal('0.1') * Decimal(str(self.prestige_level))
-            self.cash = Decimal('0')
+            self.prestige_bonus = 1.0 + PRESTIGE_BONUS_STEP * self.prestige_level
+            self.cash = 0.0
             for particle in self.particles.values():
                 particle.count = 0
+            # A reset invalidates most cached strings (costs and counts fall
+            # back to small values); start the formatter cache fresh.
+            format_number.cache_clear()
             return True
         return False
 
     def check_achievements(self) -> Optional[Achievement]:
-        for achievement in self.achievements:
-            if not achievement.unlocked and achievement.condition(self):
+        # Only still-locked achievements are scanned; each unlock prunes the
+        # list, so a completed game pays one truthiness check per tick.
+        locked = self._locked_achievements
+        if not locked:
+            return None
+
+        # One pass over the particles feeds every count-based condition.
+        self._total_particle_count = sum(p.count for p in self.particles.values())
+
+        for i, achievement in enumerate(locked):
+            if achievement.condition(self):
                 achievement.unlocked = True
                 self.prestige_bonus *= achievement.reward
+                locked.pop(i)
                 return achievement
         return None
 
     def ensure_default_particles(self):
-        default_particles = {
-            "alpha": ParticleType(
-                name="Alpha",
-                base_cost=10,
-                cost_growth=1.15,
-                base_production=1.0,
-                produces="cash",
-                color=BASE_COLORS["particle_alpha"],
-                description="Basic quantum particle, stable and reliable.",
-                upgrades=["Quantum Alignment", "Entanglement Boost"]
-            ),
-            "beta": ParticleType(
-                name="Beta",
-                base_cost=50,
-                cost_growth=1.2,
-                base_production=3.0,
-                produces="beta",
-                color=BASE_COLORS["particle_beta"],
-                description="Advanced particle used to boost Alpha production via upgrades.",
-                unlocked=False
-            ),
-            "gamma": ParticleType(
-                name="Gamma",
-                base_cost=250,
-                cost_growth=1.25,
-                base_production=10.0,
-                produces="gamma",
-                color=BASE_COLORS["particle_gamma"],
-                description="Highly energetic particle used to boost Beta production.",
-                unlocked=False
-            )
-        }
-        for name, default_particle in default_particles.items():
+        for name, spec in _PARTICLE_SPECS.items():
             if name not in self.particles:
-                self.particles[name] = default_particle
+                self.particles[name] = _make_particle(spec)
 
     def to_dict(self) -> dict:
         return {
@@ -447,10 +604,44 @@ class GameState:
         }
     
     def save(self):
+        # Snapshot on the caller's thread (a cheap dict build); serialization
+        # and disk IO happen on the worker so a K_s press or auto-save never
+        # stalls the frame. A snapshot still waiting in the slot is
+        # superseded by the newer one.
+        data = self.to_dict()
+        try:
+            self._save_queue.put_nowait(data)
+        except queue.Full:
+            try:
+                self._save_queue.get_nowait()
+                self._save_queue.task_done()
+            except queue.Empty:
+                pass
+            self._save_queue.put_nowait(data)
+
+    def flush_saves(self):
+        # Block until queued snapshots are on disk; the worker is a daemon
+        # thread, so exit must not race the final write.
+        self._save_queue.join()
+
+    def _save_loop(self):
+        while True:
+            data = self._save_queue.get()
+            self._write_save(data)
+            self._save_queue.task_done()
+
+    def _write_save(self, data: dict):
         try:
-            data = self.to_dict()
-            with open(SAVE_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+            # Write to a temp file and rename so a crash mid-save cannot
+            # truncate the existing save.
+            tmp_file = SAVE_FILE + ".tmp"
+            if orjson is not None:
+                with open(tmp_file, "wb") as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(tmp_file, "w") as f:
+                    json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, SAVE_FILE)
         except Exception as e:
             print(f"Save error: {e}")
             
@@ -460,17 +651,18 @@ class GameState:
                 print("No save file found. Starting a new game.")
                 return
 
-            with open(SAVE_FILE, "r") as f:
-                data = json.load(f)
+            with open(SAVE_FILE, "rb") as f:
+                raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
                 if not data or not isinstance(data, dict):
                     print("Invalid save file data. Starting a new game.")
                     return
 
-                self.cash = Decimal(str(data.get("cash", 50.0)))
+                self.cash = float(data.get("cash", 50.0))
                 self.prestige_level = data.get("prestige_level", 0)
-                self.prestige_bonus = Decimal(str(data.get("prestige_bonus", 1.0)))
-                self.total_earnings = Decimal(str(data.get("total_earnings", 0.0)))
+                self.prestige_bonus = float(data.get("prestige_bonus", 1.0))
+                self.total_earnings = float(data.get("total_earnings", 0.0))
                 self.last_update = time.time()
 
                 particles_data = data.get("particles", {})
@@ -483,38 +675,46 @@ class GameState:
                 self._load_upgrades(data.get("upgrades", []), self.upgrades)
                 self._load_upgrades(data.get("booster_upgrades", []), self.booster_upgrades)
                 self._load_achievements(data.get("achievements", []))
-        except json.JSONDecodeError as e:
+                self._rebuild_unlocked()
+        except ValueError as e:  # covers both json and orjson decode errors
             print(f"Load error: Invalid JSON format: {e}")
         except Exception as e:
             print(f"Load error: {e}")
 
     def _load_upgrades(self, saved_upgrades, upgrade_list):
+        by_name = {upgrade.name: upgrade for upgrade in upgrade_list}
         for saved_upgrade in saved_upgrades:
-            for upgrade in upgrade_list:
-                if upgrade.name == saved_upgrade["name"]:
-                    upgrade.unlocked = saved_upgrade["unlocked"]
-                    break
+            upgrade = by_name.get(saved_upgrade["name"])
+            if upgrade is not None:
+                upgrade.unlocked = saved_upgrade["unlocked"]
 
     def _load_achievements(self, saved_achievements):
+        by_name = {achievement.name: achievement for achievement in self.achievements}
         for saved_achievement in saved_achievements:
-            for achievement in self.achievements:
-                if achievement.name == saved_achievement["name"]:
-                    achievement.unlocked = saved_achievement["unlocked"]
-                    break
+            achievement = by_name.get(saved_achievement["name"])
+            if achievement is not None:
+                achievement.unlocked = saved_achievement["unlocked"]
 class GameEvent:
+    __slots__ = ("type", "data")
+
     def __init__(self, event_type: str, data: dict):
         self.type = event_type
         self.data = data
 
 class EventManager:
     def __init__(self):
-        self.listeners = defaultdict(list)
-    
+        self.listeners: dict = {}
+
     def subscribe(self, event_type: str, callback: Callable):
-        self.listeners[event_type].append(callback)
-    
+        self.listeners.setdefault(event_type, []).append(callback)
+
     def emit(self, event: GameEvent):
-        for callback in self.listeners[event.type]:
+        # One dict lookup, and events nobody listens to return immediately
+        # without growing the table the way defaultdict indexing would.
+        callbacks = self.listeners.get(event.type)
+        if not callbacks:
+            return
+        for callback in callbacks:
             callback(event.data)
             
 class SaveManager:
@@ -522,12 +722,18 @@ class SaveManager:
         self.game_state = game_state
         self.auto_save_interval = 300  # 5 minutes
         self._last_save = time.time()
-    
+        # Serialization and disk IO run on a worker so an auto-save never
+        # stalls the frame loop; the queue holds complete snapshots, so
+        # dropping one when the worker is behind only skips a stale state.
+        self._save_queue: queue.Queue = queue.Queue(maxsize=2)
+        self._worker = threading.Thread(target=self._write_loop, daemon=True)
+        self._worker.start()
+
     def auto_save(self):
         if time.time() - self._last_save >= self.auto_save_interval:
             self.save()
             self._last_save = time.time()
-    
+
     def save(self):
         # Implement save file versioning
         version = 1
@@ -536,10 +742,25 @@ class SaveManager:
             'timestamp': time.time(),
             'state': self.game_state.to_dict()
         }
-        # Implement backup before saving
-        self._backup_save()
-        with open(SAVE_FILE, 'w') as f:
-            json.dump(save_data, f)            
+        try:
+            self._save_queue.put_nowait(save_data)
+        except queue.Full:
+            pass  # a newer snapshot is already waiting to be written
+
+    def _write_loop(self):
+        while True:
+            save_data = self._save_queue.get()
+            # Implement backup before saving
+            self._backup_save()
+            tmp_path = SAVE_FILE + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(save_data, f, separators=(',', ':'))
+            os.replace(tmp_path, SAVE_FILE)
+
+    def _backup_save(self):
+        # Keep the previous save around in case the new write is interrupted.
+        if os.path.exists(SAVE_FILE):
+            os.replace(SAVE_FILE, SAVE_FILE + ".bak")
             
 class GameUI:
     def __init__(self, game_state: GameState):
@@ -549,304 +770,497 @@ class GameUI:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
         self.game = game_state
-        self.messages = []
+        # (expires_at, text, color), oldest first; expiry pops from the
+        # left and needs no per-message arithmetic.
+        self.messages: Deque[tuple] = deque()
+        self._text_cache = {}
+        self._button_cache = {}
+        # Redraw only when something visible changed; an idle game spends most
+        # frames with identical output.
+        self._dirty = True
+        self._last_cash = None
+        self._last_counts = {}
+        self._mouse_pos = (0, 0)
+        # Where messages were drawn last frame, so expired ones get erased
+        # when only their strip is pushed to the display.
+        self._last_msg_rect: Optional[pygame.Rect] = None
+        # The two upgrade lists never change membership after init; keep a
+        # combined view for the signature check and cache priming.
+        self._all_upgrades = game_state.upgrades + game_state.booster_upgrades
+        self._build_layout()
+        self._prime_text_cache()
+        # Everything that only changes on unlocks/purchases (panel chrome,
+        # titles, descriptions, achievement rows) is composited once onto this
+        # layer and blitted in a single call per frame.
+        self._static_layer = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
+        self._static_sig = None
+        # A recurring SDL timer wakes the event loop for economy ticks, so
+        # run() can block in event.wait() with no computed timeout.
+        pygame.time.set_timer(ECONOMY_EVENT, ECONOMY_TIMER_MS)
+
+    def _prime_text_cache(self):
+        # Constant strings (titles, descriptions, unlock hints) are known up
+        # front; rendering them now keeps the first frames from paying the
+        # glyph-rasterization cost and guarantees they are cache hits.
+        for title in ("Particles", "Upgrades", "Achievements",
+                      "Regular Upgrades", "Booster Upgrades"):
+            self._render(title, BASE_COLORS["text"])
+        for particle in self.game.particles.values():
+            self._render(particle.description, (150, 150, 150))
+        for upgrade in self._all_upgrades:
+            self._render(upgrade.description, (150, 150, 150))
+        for achievement in self.game.achievements:
+            self._render(achievement.name, BASE_COLORS["text"])
+            self._render(
+                f"{achievement.description} (x{achievement.reward} bonus)",
+                BASE_COLORS["text"]
+            )
+
+    def _build_layout(self):
+        # The panel geometry is static, so build every Rect once instead of
+        # allocating fresh ones per frame; handle_click shares these with the
+        # draw methods, keeping hit-testing and rendering in agreement.
+        self._panel_particle = pygame.Rect(20, 60, 400, 600)
+        self._panel_upgrade = pygame.Rect(440, 60, 400, 600)
+        self._panel_achievement = pygame.Rect(860, 60, 400, 300)
+        self._prestige_rect = pygame.Rect(SCREEN_SIZE[0] - 150, 20, 130, 40)
+        # Coarse update regions for pygame.display.update: the top stats
+        # strip and the prestige corner (button plus bonus readout).
+        self._stats_rect = pygame.Rect(0, 0, SCREEN_SIZE[0], 60)
+        self._prestige_region = pygame.Rect(SCREEN_SIZE[0] - 360, 10, 360, 60)
+
+        row_h = 60
+        self._particle_buy_rects = [
+            pygame.Rect(self._panel_particle.x + 280, self._panel_particle.y + 30 + i * row_h, 100, 30)
+            for i in range(len(self.game.particles))
+        ]
+        self._achievement_rects = [
+            pygame.Rect(self._panel_achievement.x + 10, self._panel_achievement.y + 30 + i * row_h, self._panel_achievement.width - 20, 50)
+            for i in range(len(self.game.achievements))
+        ]
+
+        # Upgrade rows: panel title (30), section title (30), then 60 per row;
+        # the booster section starts after the regular rows plus 20px spacing
+        # and its own title.
+        section_title_height = 30
+        y = self._panel_upgrade.y + 30 + section_title_height
+        self._upgrade_rects = []
+        for _ in self.game.upgrades:
+            self._upgrade_rects.append(pygame.Rect(self._panel_upgrade.x + 10, y, self._panel_upgrade.width - 20, 50))
+            y += row_h
+        y += 20 + section_title_height
+        self._booster_rects = []
+        for _ in self.game.booster_upgrades:
+            self._booster_rects.append(pygame.Rect(self._panel_upgrade.x + 10, y, self._panel_upgrade.width - 20, 50))
+            y += row_h
+
+        # (rect, object) pairs so the click and draw paths iterate one
+        # prebuilt sequence instead of re-zipping parallel lists per call.
+        self._particle_buttons = list(zip(self._particle_buy_rects, self.game.particles.values()))
+        self._upgrade_buttons = list(zip(self._upgrade_rects, self.game.upgrades))
+        self._booster_buttons = list(zip(self._booster_rects, self.game.booster_upgrades))
+        # Flattened view for click broadphase: collidelist scans the rect
+        # list in C and the matching pair is indexed out.
+        self._upgrade_row_rects = self._upgrade_rects + self._booster_rects
+        self._upgrade_row_buttons = self._upgrade_buttons + self._booster_buttons
 
-    def add_message(self, text: str, color: tuple = BASE_COLORS["text"]):
-        self.messages.append({
-            "text": text,
-            "color": color,
-            "time": time.time()
-        })
+        # Rounded panel backgrounds are software-rasterized on every
+        # pygame.draw.rect call; render each one once and composite from here.
+        self._panel_bg = {}
+        for rect in (self._panel_particle, self._panel_upgrade, self._panel_achievement):
+            surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, BASE_COLORS["panel_background"], surf.get_rect(), border_radius=8)
+            self._panel_bg[tuple(rect)] = surf
+
+    def _static_signature(self) -> tuple:
+        # The static layer depends only on what is unlocked or visible; when
+        # this tuple changes, the layer is stale.
+        return (
+            tuple(p.unlocked for p in self.game.particles.values()),
+            tuple(u._visible for u in self._all_upgrades),
+            tuple(a.unlocked for a in self.game.achievements),
+        )
+
+    def _rebuild_static_layer(self):
+        layer = self._static_layer
+        layer.fill((0, 0, 0, 0))
+
+        for rect, title in ((self._panel_particle, "Particles"),
+                            (self._panel_upgrade, "Upgrades"),
+                            (self._panel_achievement, "Achievements")):
+            layer.blit(self._panel_bg[tuple(rect)], rect)
+            layer.blit(self._render(title, BASE_COLORS["text"]), (rect.x + 10, rect.y + 5))
+
+        # Particle rows: locked rows are entirely static; unlocked rows
+        # contribute their description line. Row geometry comes from the
+        # prebuilt buy-button rects, same as the dynamic draw path.
+        panel = self._panel_particle
+        for i, particle in enumerate(self.game.particles.values()):
+            row_y = self._particle_buy_rects[i].y
+            if not particle.unlocked:
+                text = f"{particle.name}: {particle.count:.1f} (Locked)"
+                layer.blit(self._render(text, BASE_COLORS["text_disabled"]), (panel.x + 10, row_y))
+                unlock_text = f"(Requires ${self.format_number(BETA_UNLOCK_EARNINGS if particle.name == 'Beta' else GAMMA_UNLOCK_EARNINGS)} earned)"
+                layer.blit(self._render(unlock_text, BASE_COLORS["text_disabled"]), (panel.x + 10, row_y + 25))
+            else:
+                layer.blit(self._render(particle.description, (150, 150, 150)), (panel.x + 10, row_y + 25))
+
+        # Upgrade section titles and per-row descriptions.
+        panel = self._panel_upgrade
+        for row_rects, upgrades, title in (
+                (self._upgrade_rects, self.game.upgrades, "Regular Upgrades"),
+                (self._booster_rects, self.game.booster_upgrades, "Booster Upgrades")):
+            layer.blit(self._render(title, BASE_COLORS["text"]),
+                       (panel.x + 10, row_rects[0].y - 30 if row_rects else 0))
+            for upgrade_rect, upgrade in zip(row_rects, upgrades):
+                if upgrade._visible:
+                    layer.blit(self._render(upgrade.description, (150, 150, 150)),
+                               (upgrade_rect.x + 10, upgrade_rect.y + 30))
+
+        # Achievement rows only change when one unlocks.
+        for achievement_rect, achievement in zip(self._achievement_rects, self.game.achievements):
+            color = BASE_COLORS["achievement"] if achievement.unlocked else BASE_COLORS["button"]
+            pygame.draw.rect(layer, color, achievement_rect, border_radius=5)
+            layer.blit(self._render(achievement.name, BASE_COLORS["text"]),
+                       (achievement_rect.x + 10, achievement_rect.y + 5))
+            layer.blit(self._render(f"{achievement.description} (x{achievement.reward} bonus)", BASE_COLORS["text"]),
+                       (achievement_rect.x + 10, achievement_rect.y + 25))
+
+    def _render(self, text: str, color: tuple) -> pygame.Surface:
+        # Font.render rasterizes glyphs on every call; most strings drawn per
+        # frame (titles, descriptions, readouts) repeat, so cache surfaces by
+        # (text, color). Trim the cache if transient strings ever bloat it.
+        key = (text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 256:
+                self._text_cache.clear()
+            # convert_alpha once at render time so every later blit of this
+            # surface skips the per-blit pixel-format conversion.
+            surf = self.font.render(text, True, color).convert_alpha()
+            self._text_cache[key] = surf
+        return surf
+
+    def add_message(self, text: str, color: tuple = BASE_COLORS["text"], now: Optional[float] = None):
+        if now is None:
+            now = time.time()
+        self.messages.append((now + MESSAGE_TTL_SECONDS, text, color))
+        self._dirty = True
+
+    def add_messages(self, texts, color: tuple = BASE_COLORS["text"], now: Optional[float] = None):
+        # Batch variant: one timestamp and one dirty flip for the group.
+        if now is None:
+            now = time.time()
+        expires_at = now + MESSAGE_TTL_SECONDS
+        self.messages.extend((expires_at, text, color) for text in texts)
+        self._dirty = True
+
+    def _economy_changed(self) -> bool:
+        # A visible delta is anything that would alter an on-screen readout
+        # (two decimal places for cash, one for particle counts).
+        changed = False
+        cash = self.game.cash
+        if self._last_cash is None or abs(cash - self._last_cash) >= 0.01:
+            self._last_cash = cash
+            changed = True
+        for name, particle in self.game.particles.items():
+            last = self._last_counts.get(name)
+            if last is None or abs(particle.count - last) >= 0.01:
+                self._last_counts[name] = particle.count
+                changed = True
+        return changed
 
     def format_number(self, num: float) -> str:
-        if num >= 1_000_000:
-            return f"{num/1_000_000:.2f}M"
-        elif num >= 1_000:
-            return f"{num/1_000:.2f}K"
-        return f"{num:.2f}"
+        return format_number(round(float(num), 2))
 
-    def draw_button(self, rect: pygame.Rect, text: str, enabled: bool = True, hover: bool = False) -> None:
+    def _button_surface(self, rect: pygame.Rect, text: str, enabled: bool = True, hover: bool = False) -> pygame.Surface:
         if not enabled:
-            color = BASE_COLORS["button_disabled"]
-            text_color = BASE_COLORS["text_disabled"]
+            color = _COLOR_BUTTON_DISABLED
+            text_color = _COLOR_TEXT_DISABLED
         else:
-            color = BASE_COLORS["button_hover"] if hover else BASE_COLORS["button"]
-            text_color = BASE_COLORS["text"]
-            
-        pygame.draw.rect(self.screen, color, rect, border_radius=5)
-        text_surf = self.font.render(text, True, text_color)
-        text_rect = text_surf.get_rect(center=rect.center)
-        self.screen.blit(text_surf, text_rect)
-
-    def draw_panel(self, rect: pygame.Rect, title: Optional[str] = None) -> float:
-        pygame.draw.rect(self.screen, BASE_COLORS["panel_background"], rect, border_radius=8)
-        if title:
-            title_surf = self.font.render(title, True, BASE_COLORS["text"])
-            self.screen.blit(title_surf, (rect.x + 10, rect.y + 5))
-            return rect.y + 30
-        return rect.y + 10
-
-    def draw_achievement_panel(self):
-        panel_rect = pygame.Rect(860, 60, 400, 300)
-        y_offset = self.draw_panel(panel_rect, "Achievements")
-        
-        for achievement in self.game.achievements:
-            achievement_rect = pygame.Rect(panel_rect.x + 10, y_offset, panel_rect.width - 20, 50)
-            color = BASE_COLORS["achievement"] if achievement.unlocked else BASE_COLORS["button"]
-            pygame.draw.rect(self.screen, color, achievement_rect, border_radius=5)
-            
-            name_surf = self.font.render(achievement.name, True, BASE_COLORS["text"])
-            self.screen.blit(name_surf, (achievement_rect.x + 10, achievement_rect.y + 5))
-            
-            desc_surf = self.font.render(
-                f"{achievement.description} (x{achievement.reward} bonus)",
-                True,
-                BASE_COLORS["text"]
-            )
-            self.screen.blit(desc_surf, (achievement_rect.x + 10, achievement_rect.y + 25))
-            
-            y_offset += 60
+            color = _COLOR_BUTTON_HOVER if hover else _COLOR_BUTTON
+            text_color = _COLOR_TEXT
 
-    def draw_particle_panel(self):
-        panel_rect = pygame.Rect(20, 60, 400, 600)
-        y_offset = self.draw_panel(panel_rect, "Particles")
-        
-        for particle in self.game.particles.values():
-            text = f"{particle.name}: {particle.count:.1f}"  # Show 1 decimal place
+        # Rasterizing the rounded rect and centering the label are the
+        # expensive part; a button's pixels are fully determined by its size,
+        # fill color (which encodes enabled/hover), and text, so cache the
+        # composited surface and reuse it whole.
+        key = (rect.width, rect.height, color, text)
+        surf = self._button_cache.get(key)
+        if surf is None:
+            if len(self._button_cache) >= 256:
+                self._button_cache.clear()
+            surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=5)
+            text_surf = self._render(text, text_color)
+            surf.blit(text_surf, ((rect.width - text_surf.get_width()) // 2,
+                                  (rect.height - text_surf.get_height()) // 2))
+            self._button_cache[key] = surf
+        return surf
+
+    def draw_button(self, rect: pygame.Rect, text: str, enabled: bool = True, hover: bool = False) -> None:
+        self.screen.blit(self._button_surface(rect, text, enabled=enabled, hover=hover), rect)
+
+    def draw_particle_panel(self, mouse_pos: tuple) -> pygame.Rect:
+        # Panel chrome, locked rows, and descriptions live on the static
+        # layer; only the count/production readouts and buy buttons remain.
+        panel_rect = self._panel_particle
+
+        # Gather the row surfaces and push them in a single blits() call:
+        # one Python-to-C transition for the whole panel instead of one
+        # per readout and button.
+        blit_list = []
+        # One panel-bounds test up front; rows only re-test hover when the
+        # mouse is actually over the panel.
+        in_panel = _hit(panel_rect.x, panel_rect.y, panel_rect.w, panel_rect.h, *mouse_pos)
+        for i, (name, particle) in enumerate(self.game.particles.items()):
             if not particle.unlocked:
-                text += " (Locked)"
-                text_surf = self.font.render(text, True, BASE_COLORS["text_disabled"])
-                self.screen.blit(text_surf, (panel_rect.x + 10, y_offset))
-                unlock_text = f"(Requires ${self.format_number(500 if particle.name == 'Beta' else 5000)} earned)"
-                unlock_surf = self.font.render(unlock_text, True, BASE_COLORS["text_disabled"])
-                self.screen.blit(unlock_surf, (panel_rect.x + 10, y_offset + 25))
-                y_offset += 60
                 continue
-            
-            production = particle.calculate_production_per_second(self.game.prestige_bonus)
-            text += f" (${self.format_number(production)}/s)"
-            text_surf = self.font.render(text, True, particle.color)
-            self.screen.blit(text_surf, (panel_rect.x + 10, y_offset))
-            desc_surf = self.font.render(particle.description, True, (150, 150, 150))
-            self.screen.blit(desc_surf, (panel_rect.x + 10, y_offset + 25))
-            
-            btn_rect = pygame.Rect(panel_rect.x + 280, y_offset, 100, 30)
-            mouse_pos = pygame.mouse.get_pos()
-            hover = btn_rect.collidepoint(mouse_pos)
+
+            # Row geometry comes from the prebuilt rects (the readout shares
+            # the buy button's row), not from re-summed offsets.
+            btn_rect = self._particle_buy_rects[i]
+
+            # update_economy already computed this tick's production; reuse it
+            # rather than recomputing per frame.
+            production = self.game._production_cache.get(name, 0.0)
+            text = f"{particle.name}: {particle.count:.1f} (${self.format_number(production)}/s)"
+            blit_list.append((self._render(text, particle.color), (panel_rect.x + 10, btn_rect.y)))
+
+            hover = in_panel and btn_rect.collidepoint(mouse_pos)
             cost = particle.calculate_cost()
             can_afford = self.game.cash >= cost
             btn_text = f"Buy (${self.format_number(cost)})"
-            self.draw_button(btn_rect, btn_text, enabled=can_afford, hover=hover)
-            y_offset += 60
+            blit_list.append((self._button_surface(btn_rect, btn_text, enabled=can_afford, hover=hover), btn_rect))
+        self.screen.blits(blit_list)
+        return panel_rect
 
-    def draw_upgrade_section(self, panel_rect, y_offset, upgrades, title):
-        title_surf = self.font.render(title, True, BASE_COLORS["text"])
-        self.screen.blit(title_surf, (panel_rect.x + 10, y_offset))
-        y_offset += 30
-        
-        for upgrade in upgrades:
-            if upgrade.particle_requirement not in self.game.particles:
-                continue
-            required_particle = self.game.particles[upgrade.particle_requirement]
-            if not required_particle.unlocked:
+    def draw_upgrade_section(self, buttons, mouse_pos: tuple, blit_list: list, check_hover: bool = True):
+        # Titles and descriptions come from the static layer; collect only
+        # the buttons, whose label and enabled/hover state are dynamic.
+        for upgrade_rect, upgrade in buttons:
+            if not upgrade._visible:
                 continue
-            
-            upgrade_rect = pygame.Rect(panel_rect.x + 10, y_offset, panel_rect.width - 20, 50)
-            mouse_pos = pygame.mouse.get_pos()
-            hover = upgrade_rect.collidepoint(mouse_pos)
-            
+
             if upgrade.unlocked:
                 text = f"{upgrade.name} (Purchased)"
-                self.draw_button(upgrade_rect, text, enabled=False)
+                blit_list.append((self._button_surface(upgrade_rect, text, enabled=False), upgrade_rect))
             else:
-                if upgrade.currency == 'cash':
+                if upgrade._currency_particle is None:
                     can_afford = self.game.cash >= upgrade.cost
-                    formatted_cost = f"${self.format_number(upgrade.cost)}"
                 else:
-                    particle_count = self.game.particles[upgrade.currency].count
-                    can_afford = particle_count >= upgrade.cost
-                    formatted_cost = f"{upgrade.cost} {upgrade.currency}"
-                text = f"{upgrade.name} - {formatted_cost}"
-                self.draw_button(upgrade_rect, text, enabled=can_afford, hover=hover)
-            
-            desc_surf = self.font.render(upgrade.description, True, (150, 150, 150))
-            self.screen.blit(desc_surf, (upgrade_rect.x + 10, upgrade_rect.y + 30))
-            y_offset += 60
-        return y_offset
-
-    def draw_upgrade_panel(self):
-        panel_rect = pygame.Rect(440, 60, 400, 600)
-        y_offset = self.draw_panel(panel_rect, "Upgrades")
-        
-        y_offset = self.draw_upgrade_section(panel_rect, y_offset, self.game.upgrades, "Regular Upgrades")
-        y_offset += 20
-        y_offset = self.draw_upgrade_section(panel_rect, y_offset, self.game.booster_upgrades, "Booster Upgrades")
+                    can_afford = upgrade._currency_particle.count >= upgrade.cost
+                text = f"{upgrade.name} - {upgrade.cost_text()}"
+                hover = check_hover and upgrade_rect.collidepoint(mouse_pos)
+                blit_list.append((self._button_surface(upgrade_rect, text, enabled=can_afford, hover=hover), upgrade_rect))
+
+    def draw_upgrade_panel(self, mouse_pos: tuple) -> pygame.Rect:
+        blit_list = []
+        panel = self._panel_upgrade
+        check_hover = _hit(panel.x, panel.y, panel.w, panel.h, *mouse_pos)
+        self.draw_upgrade_section(self._upgrade_buttons, mouse_pos, blit_list, check_hover)
+        self.draw_upgrade_section(self._booster_buttons, mouse_pos, blit_list, check_hover)
+        self.screen.blits(blit_list)
+        return self._panel_upgrade
 
-    def draw_stats_panel(self):
+    def draw_stats_panel(self) -> pygame.Rect:
         cash_text = f"Quantum Funds: ${self.format_number(self.game.cash)}"
-        cash_surf = self.font.render(cash_text, True, (100, 200, 100))
+        cash_surf = self._render(cash_text, (100, 200, 100))
         self.screen.blit(cash_surf, (20, 20))
         
         beta_text = f"Beta Particles: {self.game.particles['beta'].count:.1f}"  # Show 1 decimal
-        beta_surf = self.font.render(beta_text, True, (200, 200, 200))
+        beta_surf = self._render(beta_text, (200, 200, 200))
         self.screen.blit(beta_surf, (300, 20))
         
         gamma_text = f"Gamma Particles: {self.game.particles['gamma'].count:.1f}"  # Show 1 decimal
-        gamma_surf = self.font.render(gamma_text, True, (200, 200, 200))
+        gamma_surf = self._render(gamma_text, (200, 200, 200))
         self.screen.blit(gamma_surf, (500, 20))
         
         earnings_text = f"Total Earnings: ${self.format_number(self.game.total_earnings)}"
-        earnings_surf = self.font.render(earnings_text, True, (200, 200, 200))
+        earnings_surf = self._render(earnings_text, (200, 200, 200))
         self.screen.blit(earnings_surf, (700, 20))
+        return self._stats_rect
 
-    def draw_prestige_button(self):
-        prestige_rect = pygame.Rect(SCREEN_SIZE[0] - 150, 20, 130, 40)
-        mouse_pos = pygame.mouse.get_pos()
+    def draw_prestige_button(self, mouse_pos: tuple) -> pygame.Rect:
+        prestige_rect = self._prestige_rect
         hover = prestige_rect.collidepoint(mouse_pos)
-        can_prestige = self.game.cash >= 1000
-        text = f"Prestige (${self.format_number(1000)})"
+        can_prestige = self.game.cash >= PRESTIGE_THRESHOLD
+        text = f"Prestige (${self.format_number(PRESTIGE_THRESHOLD)})"
         self.draw_button(prestige_rect, text, enabled=can_prestige, hover=hover)
         if self.game.prestige_level > 0:
             bonus_text = f"Prestige Bonus: x{self.format_number(self.game.prestige_bonus)}"
-            bonus_surf = self.font.render(bonus_text, True, (200, 150, 255))
+            bonus_surf = self._render(bonus_text, (200, 150, 255))
             self.screen.blit(bonus_surf, (SCREEN_SIZE[0] - 350, 30))
+        return self._prestige_region
 
-    def draw_messages(self):
-        now = time.time()
+    def draw_messages(self, now: Optional[float] = None) -> Optional[pygame.Rect]:
+        if now is None:
+            now = time.time()
         y_offset = SCREEN_SIZE[1] - 50
-        
-        for msg in self.messages[:]:
-            if now - msg["time"] < 3:
-                text_surf = self.font.render(msg["text"], True, msg["color"])
-                text_rect = text_surf.get_rect(right=SCREEN_SIZE[0] - 20, bottom=y_offset)
-                self.screen.blit(text_surf, text_rect)
-                y_offset -= 30
-            else:
-                self.messages.remove(msg)
 
-    def handle_click(self):
-        mouse_pos = pygame.mouse.get_pos()
-        
-        prestige_rect = pygame.Rect(SCREEN_SIZE[0] - 150, 20, 130, 40)
-        if prestige_rect.collidepoint(mouse_pos):
+        # Messages are appended in time order, so all expired entries sit at
+        # the left end of the deque.
+        while self.messages and self.messages[0][0] <= now:
+            self.messages.popleft()
+
+        for _, text, color in self.messages:
+            text_surf = self._render(text, color)
+            self.screen.blit(text_surf, (SCREEN_SIZE[0] - 20 - text_surf.get_width(),
+                                         y_offset - text_surf.get_height()))
+            y_offset -= 30
+
+        # Report the strip the messages occupy now, unioned with last
+        # frame's, so a pushed update also erases entries that expired.
+        current = None
+        if self.messages:
+            top = y_offset - 30
+            current = pygame.Rect(0, top, SCREEN_SIZE[0], SCREEN_SIZE[1] - top)
+        dirty = current
+        if self._last_msg_rect is not None:
+            dirty = self._last_msg_rect if dirty is None else dirty.union(self._last_msg_rect)
+        self._last_msg_rect = current
+        return dirty
+
+    def handle_click(self, mouse_pos: tuple):
+
+        if self._prestige_rect.collidepoint(mouse_pos):
             if self.game.perform_prestige():
                 self.add_message("Prestige achieved! Particles reset.", (200, 150, 255))
             else:
-                self.add_message("Not enough funds for prestige!", BASE_COLORS["error"])
+                self.add_message("Not enough funds for prestige!", _COLOR_ERROR)
             return
 
-        # Handle particle purchases
-        panel_rect = pygame.Rect(20, 60, 400, 600)
-        y_offset = panel_rect.y + 30
-        
-        for particle in self.game.particles.values():
-            btn_rect = pygame.Rect(panel_rect.x + 280, y_offset, 100, 30)
-            if btn_rect.collidepoint(mouse_pos):
-                if not particle.unlocked:
-                    continue
+        # One bounds test per panel decides which row scan (if any) runs;
+        # clicks on dead space never touch the per-row loops.
+        if self._panel_particle.collidepoint(mouse_pos):
+            self._handle_particle_click(mouse_pos)
+        elif self._panel_upgrade.collidepoint(mouse_pos):
+            # Same C-level broadphase as the particle buttons: one
+            # collidelist call instead of a collidepoint per row.
+            idx = pygame.Rect(mouse_pos, (1, 1)).collidelist(self._upgrade_row_rects)
+            if idx != -1:
+                upgrade_rect, upgrade = self._upgrade_row_buttons[idx]
+                self.process_upgrade_click(upgrade, upgrade_rect, mouse_pos)
+
+    def _handle_particle_click(self, mouse_pos: tuple):
+        # One C-level broadphase over the prebuilt buy-button rects instead
+        # of a Python collidepoint per row.
+        idx = pygame.Rect(mouse_pos, (1, 1)).collidelist(self._particle_buy_rects)
+        if idx != -1:
+            particle = self._particle_buttons[idx][1]
+            if particle.unlocked:
                 cost = particle.calculate_cost()
                 if self.game.cash >= cost:
                     self.game.cash -= cost
                     particle.count += 1
                     self.add_message(f"Acquired {particle.name} Particle!", particle.color)
                 else:
-                    self.add_message(f"Not enough funds for {particle.name} particle!", BASE_COLORS["error"])
-            y_offset += 60
-
-        # Handle upgrades with corrected positioning
-        upgrade_panel_rect = pygame.Rect(440, 60, 400, 600)
-        y_offset = upgrade_panel_rect.y + 30  # Start after panel title
-        
-        # Process regular upgrades
-        section_title_height = 30
-        y_offset += section_title_height  # "Regular Upgrades" title
-        for upgrade in self.game.upgrades:
-            self.process_upgrade_click(upgrade, upgrade_panel_rect, y_offset, mouse_pos)
-            y_offset += 60
-        
-        # Add spacing between sections
-        y_offset += 20  # Section spacing
-        y_offset += section_title_height  # "Booster Upgrades" title
-        
-        # Process booster upgrades
-        for upgrade in self.game.booster_upgrades:
-            self.process_upgrade_click(upgrade, upgrade_panel_rect, y_offset, mouse_pos)
-            y_offset += 60
+                    self.add_message(f"Not enough funds for {particle.name} particle!", _COLOR_ERROR)
 
-    def process_upgrade_click(self, upgrade, panel_rect, y_offset, mouse_pos):
-        if upgrade.particle_requirement not in self.game.particles:
-            return
-        required_particle = self.game.particles[upgrade.particle_requirement]
-        if not required_particle.unlocked:
+    def process_upgrade_click(self, upgrade, upgrade_rect, mouse_pos):
+        if not upgrade._visible:
             return
-        
-        upgrade_rect = pygame.Rect(
-            panel_rect.x + 10,
-            y_offset,
-            panel_rect.width - 20,
-            50
-        )
-        
+
         if upgrade_rect.collidepoint(mouse_pos) and not upgrade.unlocked:
-            currency_type = upgrade.currency
-            if currency_type == 'cash':
+            currency = upgrade._currency_particle
+            if currency is None:
                 can_afford = self.game.cash >= upgrade.cost
             else:
-                if currency_type not in self.game.particles:
-                    return
-                can_afford = self.game.particles[currency_type].count >= upgrade.cost
-            
+                can_afford = currency.count >= upgrade.cost
+
             if can_afford:
-                if currency_type == 'cash':
+                if currency is None:
                     self.game.cash -= upgrade.cost
                 else:
-                    self.game.particles[currency_type].count -= upgrade.cost
-                upgrade.effect()
+                    currency.count -= upgrade.cost
+                self.game.apply_upgrade_effect(upgrade)
                 upgrade.unlocked = True
-                self.add_message(f"Upgrade purchased: {upgrade.name}", BASE_COLORS["success"])
+                self.add_message(f"Upgrade purchased: {upgrade.name}", _COLOR_SUCCESS)
             else:
-                if currency_type == 'cash':
+                if currency is None:
                     msg = f"Not enough funds for {upgrade.name}!"
                 else:
-                    msg = f"Not enough {currency_type} particles!"
-                self.add_message(msg, BASE_COLORS["error"])
+                    msg = f"Not enough {upgrade.currency} particles!"
+                self.add_message(msg, _COLOR_ERROR)
 
     def run(self):
         running = True
         while running:
-            unlock_messages = self.game.update_economy()
-            if unlock_messages:
-                for msg in unlock_messages:
-                    self.add_message(msg, BASE_COLORS["success"])
-            achievement = self.game.check_achievements()
-            if achievement:
-                self.add_message(
-                    f"Achievement unlocked: {achievement.name}! (x{achievement.reward} bonus)",
-                    BASE_COLORS["achievement"]
-                )
-            
-            for event in pygame.event.get():
+            # Block until input arrives or the ECONOMY_EVENT timer fires;
+            # an idle clicker spends almost all its time in this wait.
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+
+            # One SDL query per frame; the draw methods reuse it for hover.
+            self._mouse_pos = pygame.mouse.get_pos()
+            now = time.time()
+
+            for event in events:
                 if event.type == QUIT:
                     running = False
+                elif event.type == ECONOMY_EVENT:
+                    # The economy still throttles itself, which absorbs late
+                    # or coalesced timer events; None means not due yet.
+                    unlock_messages = self.game.update_economy(now=now)
+                    if unlock_messages is not None:
+                        if unlock_messages:
+                            self.add_messages(unlock_messages, _COLOR_SUCCESS, now=now)
+                        achievement = self.game.check_achievements()
+                        if achievement:
+                            self.add_message(
+                                f"Achievement unlocked: {achievement.name}! (x{achievement.reward} bonus)",
+                                _COLOR_ACHIEVEMENT
+                            )
                 elif event.type == MOUSEBUTTONDOWN:
-                    self.handle_click()
+                    # The event carries the click position; no extra SDL query.
+                    self.handle_click(event.pos)
+                    self._dirty = True
+                elif event.type == MOUSEMOTION:
+                    # Hover highlights track the pointer.
+                    self._dirty = True
                 elif event.type == KEYDOWN:
                     if event.key == K_s:
                         self.game.save()
-                        self.add_message("Game saved!", BASE_COLORS["success"])
-
-            self.screen.fill(BASE_COLORS["background"])
-            self.draw_stats_panel()
-            self.draw_prestige_button()
-            self.draw_particle_panel()
-            self.draw_upgrade_panel()
-            self.draw_achievement_panel()
-            self.draw_messages()
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+                        self.add_message("Game saved!", _COLOR_SUCCESS)
+
+            if self._economy_changed():
+                self._dirty = True
+            # An expiring message also changes the frame.
+            if self.messages and self.messages[0][0] <= now:
+                self._dirty = True
+
+            if self._dirty:
+                self.screen.fill(_COLOR_BG)
+                sig = self._static_signature()
+                static_changed = sig != self._static_sig
+                if static_changed:
+                    self._rebuild_static_layer()
+                    self._static_sig = sig
+                self.screen.blit(self._static_layer, (0, 0))
+                dirty_rects = [
+                    self.draw_stats_panel(),
+                    self.draw_prestige_button(self._mouse_pos),
+                    self.draw_particle_panel(self._mouse_pos),
+                    self.draw_upgrade_panel(self._mouse_pos),
+                    self.draw_messages(now=now),
+                ]
+
+                if static_changed:
+                    # Unlocks touch regions outside the tracked ones
+                    # (achievement panel, locked rows); push the whole frame.
+                    pygame.display.flip()
+                else:
+                    # Typical frame: only the readout regions changed, so
+                    # only that pixel bandwidth is spent.
+                    pygame.display.update([r for r in dirty_rects if r is not None])
+                self._dirty = False
+                # event.wait does the idle sleeping; the clock only caps the
+                # redraw rate during continuous input (mouse motion).
+                self.clock.tick(30)
 
+        pygame.time.set_timer(ECONOMY_EVENT, 0)
         self.game.save()
+        self.game.flush_saves()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -855,5 +1269,6 @@ if __name__ == "__main__":
         os.remove(SAVE_FILE)
     game_state = GameState()
     game_state.load()
+    game_state.warm_caches()
     ui = GameUI(game_state)
     ui.run()